@@ -5,17 +5,25 @@ and creating a sample JSON file.
 """
 
 import argparse
+import asyncio
+import atexit
 import csv
-import json
 import logging
 import os
+import queue
 import random
 import re
+import socket
+import sqlite3
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from logging.handlers import QueueHandler, QueueListener
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple
 
-import requests
+import aiohttp
+import httpx
+import orjson
+import zstandard as zstd
 from dotenv import load_dotenv
 from faker import Faker
 
@@ -31,106 +39,299 @@ def setup_logging(debug: bool = False):
     # Create logs directory if it doesn't exist
     os.makedirs('logs', exist_ok=True)
     
-    # Configure logging
+    # File and console output is written by a background listener thread, so
+    # logging calls only enqueue records instead of blocking on handler I/O
+    formatter = logging.Formatter(log_format)
+    handlers = [
+        logging.FileHandler(f'logs/extract_dividends_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # Configure logging; records are fully formatted by the listener's handlers
     logging.basicConfig(
         level=log_level,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(f'logs/extract_dividends_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-            logging.StreamHandler()
-        ]
+        format='%(message)s',
+        handlers=[QueueHandler(log_queue)]
     )
     
+    # httpx logs every request at INFO; keep that per-request noise for --debug runs
+    if not debug:
+        for name in ('httpx', 'httpcore'):
+            logging.getLogger(name).setLevel(logging.WARNING)
+    
     return logging.getLogger(__name__)
 
 # Configuration
 API_KEY = os.getenv('TWELVE_DATA_API_KEY')
+API_REQUESTS_PER_MINUTE = int(os.getenv('TWELVE_DATA_REQUESTS_PER_MINUTE') or '8')  # 8 = free plan; empty means default
 BASE_URL = 'https://api.twelvedata.com'
+COMMON_PARAMS = {'apikey': API_KEY}
+ENDPOINTS = {name: f'{BASE_URL}/{name}' for name in ('stocks', 'dividends_calendar', 'edgar_filings/archive')}
+
+# Concurrency limits
+SYMBOL_CONCURRENCY = 8   # Default number of symbols processed at once
+SEC_CONCURRENCY = 10     # In-flight SEC downloads
+SEC_REQUESTS_PER_SECOND = 10  # SEC fair-access policy
+
+# Retry policy for transient HTTP errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+
+DNS_CACHE_TTL = 600  # Seconds to keep resolved addresses
+
+
+
+class RateLimiter:
+    """Token bucket limiting the request rate across all concurrent tasks.
+    
+    The bucket holds a single token, so requests are spaced per / rate seconds
+    apart and no window of `per` seconds ever sees more than `rate` requests.
+    """
+    
+    def __init__(self, rate: float, per: float):
+        self.rate = rate
+        self.per = per
+        self.allowance = 1.0
+        self.last = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.allowance = min(1.0, self.allowance + (now - self.last) * self.rate / self.per)
+                self.last = now
+                if self.allowance >= 1:
+                    self.allowance -= 1
+                    return
+                await asyncio.sleep((1 - self.allowance) * self.per / self.rate)
+
+
+SEC_SEMAPHORE = asyncio.Semaphore(SEC_CONCURRENCY)
+api_limiter = RateLimiter(API_REQUESTS_PER_MINUTE, 60.0)
+sec_limiter = RateLimiter(SEC_REQUESTS_PER_SECOND, 1.0)
+
+# Streaming search for dividend content in SEC files. All keywords are matched
+# case-insensitively in a single pass by one compiled alternation. An empty setting
+# (e.g. a bare DIVIDEND_KEYWORDS= line in .env) falls back to the default keyword
+DIVIDEND_KEYWORDS = sorted({k.strip().lower() for k in os.getenv('DIVIDEND_KEYWORDS', '').split(',') if k.strip()}) or ['dividend']
+DIVIDEND_KEYWORDS_KEY = ','.join(DIVIDEND_KEYWORDS)  # Recorded with cached results
+DIVIDEND_PATTERN = re.compile(b'|'.join(re.escape(k.encode()) for k in DIVIDEND_KEYWORDS), re.IGNORECASE)
+SCAN_CHUNK_SIZE = 65536
+SCAN_OVERLAP = max(len(k.encode()) for k in DIVIDEND_KEYWORDS)
+SCAN_MAX_BYTES = 1_048_576  # Dividend mentions appear in the first pages of 8-K documents
+SCAN_RANGE = f'bytes=0-{SCAN_MAX_BYTES - 1}'
+
+# Persistent cache of SEC file checks, revalidated with ETags across runs
+SEC_CACHE_PATH = 'cache/sec_cache.sqlite'
+MAX_SEC_FILE_SIZE = 20_000_000
+SEC_HTML_TYPES = {'text/html', 'application/xhtml+xml'}
+SEC_ARCHIVES_PREFIX = 'https://www.sec.gov/Archives/edgar/data/'  # Filed documents never change
+
+# Checks started during this run by URL; filings shared between symbols are fetched once
+sec_url_checks: Dict[str, asyncio.Task] = {}
+
+ZSTD_LEVEL = 10  # Compression level for --compress output
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create a pooled HTTP session with DNS caching."""
+    # This session only talks to api.twelvedata.com, so cached IPv4 lookups make DNS a one-off cost
+    connector = aiohttp.TCPConnector(
+        limit=64,
+        limit_per_host=10,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        family=socket.AF_INET
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30))
+
+
+def create_sec_client() -> httpx.AsyncClient:
+    """Create an HTTP/2 client for SEC downloads.
+    
+    HTTP/2 multiplexes concurrent downloads over a few connections and compresses
+    the repeated request headers.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        timeout=30.0,
+        follow_redirects=True
+    )
+
+
+async def get_with_retry(session: aiohttp.ClientSession, url: str, limiter: RateLimiter, logger: logging.Logger, **kwargs) -> aiohttp.ClientResponse:
+    """Send a rate-limited GET request, retrying transient failures with exponential backoff."""
+    for attempt in range(MAX_RETRIES + 1):
+        delay = BACKOFF_FACTOR * (2 ** attempt)
+        await limiter.acquire()
+        try:
+            response = await session.get(url, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            logger.debug("Request to %s failed (%r), retrying in %.2f seconds", url, e, delay)
+        else:
+            if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            response.release()
+            logger.debug("Got status %s from %s, retrying in %.2f seconds", response.status, url, delay)
+        await asyncio.sleep(delay)
+
+
+async def stream_sec_file(client: httpx.AsyncClient, url: str, headers: Dict, logger: logging.Logger) -> httpx.Response:
+    """Open a rate-limited streaming GET for a SEC file, retrying transient failures.
+    
+    The caller must close the returned response with aclose().
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        delay = BACKOFF_FACTOR * (2 ** attempt)
+        await sec_limiter.acquire()
+        try:
+            response = await client.send(client.build_request('GET', url, headers=headers), stream=True)
+        except httpx.TransportError as e:
+            if attempt == MAX_RETRIES:
+                raise
+            logger.debug("Request to %s failed (%r), retrying in %.2f seconds", url, e, delay)
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            await response.aclose()
+            logger.debug("Got status %s from %s, retrying in %.2f seconds", response.status_code, url, delay)
+        await asyncio.sleep(delay)
+
 
 # Initialize faker instance
 fake = Faker()
 
+# Pre-generated user agents (similar to Go example: FirstName LastName Email), so Faker
+# is only called at startup rather than for every SEC request
+UA_POOL_SIZE = 256
+UA_POOL = [f"{fake.first_name()} {fake.last_name()} {fake.email()}" for _ in range(UA_POOL_SIZE)]
+
+# Optional fixed user agent ("Company contact@example.com") as SEC fair-access policy expects
+SEC_USER_AGENT = os.getenv('SEC_USER_AGENT')
+
 def generate_random_user_agent() -> str:
-    """Generate a random user agent with fake name and email, similar to Go faker logic."""
-    # Generate random person data
-    first_name = fake.first_name()
-    last_name = fake.last_name()
-    email = fake.email()
-    
-    # Create user agent string (similar to Go example: FirstName LastName Email)
-    user_agent = f"{first_name} {last_name} {email}"
-    
-    return user_agent
+    """Return the configured SEC user agent, or a random one from the pre-generated pool."""
+    return SEC_USER_AGENT or random.choice(UA_POOL)
+
+
+def open_sec_cache(path: str) -> sqlite3.Connection:
+    """Open the SEC file cache database, creating it if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS sec_files '
+        '(url TEXT PRIMARY KEY, etag TEXT, has_dividend INTEGER, keywords TEXT, fetched_at INTEGER)'
+    )
+    return conn
+
+
+def get_cached_result(conn: sqlite3.Connection, url: str) -> Optional[Tuple[Optional[str], bool]]:
+    """Return the cached (ETag, has_dividend) for a SEC file URL checked with the current keywords, if any."""
+    row = conn.execute(
+        'SELECT etag, has_dividend FROM sec_files WHERE url = ? AND keywords = ?',
+        (url, DIVIDEND_KEYWORDS_KEY)
+    ).fetchone()
+    return (row[0], bool(row[1])) if row else None
+
+
+def store_cached_result(conn: sqlite3.Connection, url: str, etag: Optional[str], has_dividend: bool):
+    """Save the result of a SEC file check to the cache."""
+    with conn:
+        conn.execute(
+            'INSERT OR REPLACE INTO sec_files (url, etag, has_dividend, keywords, fetched_at) VALUES (?, ?, ?, ?, ?)',
+            (url, etag, int(has_dividend), DIVIDEND_KEYWORDS_KEY, int(time.time()))
+        )
 
 
 def load_symbols(filename: str) -> List[Tuple[str, str]]:
     """Load symbols and exchanges from the symbols.csv file."""
-    symbols = []
-    with open(filename, 'r') as file:
-        csv_reader = csv.DictReader(file)
-        for row in csv_reader:
-            symbol = row['symbol_ticker'].strip()
-            exchange = row['exchange'].strip()
-            if symbol and exchange:
-                symbols.append((symbol, exchange))
-    return symbols
-
-
-def make_api_request(endpoint: str, params: Dict, logger: logging.Logger) -> Optional[Dict]:
+    with open(filename, 'r', newline='') as file:
+        csv_reader = csv.reader(file)
+        header = next(csv_reader)
+        symbol_index = header.index('symbol_ticker')
+        exchange_index = header.index('exchange')
+        rows = ((row[symbol_index].strip(), row[exchange_index].strip()) for row in csv_reader if row)
+        return [(symbol, exchange) for symbol, exchange in rows if symbol and exchange]
+
+
+async def make_api_request(session: aiohttp.ClientSession, endpoint: str, params: Dict, logger: logging.Logger) -> Optional[Dict]:
     """Make a request to the Twelve Data API."""
     if not API_KEY:
         raise ValueError("TWELVE_DATA_API_KEY environment variable is required")
     
-    params['apikey'] = API_KEY
-    url = f"{BASE_URL}/{endpoint}"
+    url = ENDPOINTS[endpoint]
     
     # Log the request details (without API key for security)
-    safe_params = {k: v for k, v in params.items() if k != 'apikey'}
-    logger.debug(f"Making API request to {endpoint}")
-    logger.debug(f"URL: {url}")
-    logger.debug(f"Parameters: {safe_params}")
+    logger.debug("Making API request to %s", endpoint)
+    logger.debug("URL: %s", url)
+    logger.debug("Parameters: %s", params)
     
     try:
         start_time = time.time()
-        response = requests.get(url, params=params, timeout=30)
-        request_duration = time.time() - start_time
-        
-        logger.debug(f"API request completed in {request_duration:.2f} seconds")
-        logger.debug(f"Response status code: {response.status_code}")
-        logger.debug(f"Response headers: {dict(response.headers)}")
-        
-        response.raise_for_status()
-        data = response.json()
+        async with await get_with_retry(session, url, api_limiter, logger, params={**COMMON_PARAMS, **params}) as response:
+            request_duration = time.time() - start_time
+            
+            logger.debug("API request completed in %.2f seconds", request_duration)
+            logger.debug("Response status code: %s", response.status)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response headers: %s", dict(response.headers))
+            
+            response.raise_for_status()
+            body = await response.read()
+            try:
+                data = orjson.loads(body)
+            except orjson.JSONDecodeError as e:
+                logger.error(f"Failed to parse JSON response from {endpoint}: {e}")
+                # Decode only the logged snippet instead of the whole body
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Response content: %s...", body[:500].decode('utf-8', errors='replace'))
+                return None
         
         # Log response summary
-        if isinstance(data, dict):
+        if isinstance(data, dict) and logger.isEnabledFor(logging.DEBUG):
             if 'data' in data:
                 data_length = len(data['data']) if isinstance(data['data'], list) else 1
-                logger.debug(f"Response contains {data_length} data items")
+                logger.debug("Response contains %s data items", data_length)
             if 'status' in data:
-                logger.debug(f"API status: {data['status']}")
+                logger.debug("API status: %s", data['status'])
             if 'message' in data:
-                logger.debug(f"API message: {data['message']}")
+                logger.debug("API message: %s", data['message'])
         
         logger.info(f"Successfully retrieved data from {endpoint}")
         return data
         
-    except requests.exceptions.RequestException as e:
-        logger.error(f"API request failed for {endpoint}: {e}")
-        logger.debug(f"Request details - URL: {url}, Params: {safe_params}")
-        return None
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON response from {endpoint}: {e}")
-        logger.debug(f"Response content: {response.text[:500]}...")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        # A ClientResponseError's str/repr carries the request URL (with apikey) and headers
+        if isinstance(e, aiohttp.ClientResponseError):
+            reason = f"HTTP {e.status} {e.message}"
+        else:
+            reason = str(e) or type(e).__name__
+        logger.error(f"API request failed for {endpoint}: {reason}")
+        logger.debug("Request details - URL: %s, Params: %s", url, params)
         return None
 
 
-def get_symbol_info(symbol: str, exchange: str, logger: logging.Logger) -> Optional[Dict]:
+async def get_symbol_info(session: aiohttp.ClientSession, symbol: str, exchange: str, logger: logging.Logger) -> Optional[Dict]:
     """Retrieve symbol info from the /stocks endpoint."""
     logger.info(f"Getting symbol info for {symbol} on {exchange}")
     
     params = {'symbol': symbol, 'exchange': exchange}
-    data = make_api_request('stocks', params, logger)
+    data = await make_api_request(session, 'stocks', params, logger)
     
     if not data or 'data' not in data or not data['data']:
         logger.warning(f"No data found for symbol {symbol} on {exchange}")
@@ -143,11 +344,11 @@ def get_symbol_info(symbol: str, exchange: str, logger: logging.Logger) -> Optio
         'exchange': stock_data.get('exchange', exchange)  # Use provided exchange as fallback
     }
     
-    logger.debug(f"Symbol info for {symbol}: {result}")
+    logger.debug("Symbol info for %s: %s", symbol, result)
     return result
 
 
-def get_sec_reports(symbol: str, start_date: str, end_date: str, exchange:str, logger: logging.Logger) -> List[Dict]:
+async def get_sec_reports(session: aiohttp.ClientSession, sec_client: httpx.AsyncClient, sec_cache: sqlite3.Connection, symbol: str, start_date: str, end_date: str, exchange: str, logger: logging.Logger) -> List[Dict]:
     """Retrieve SEC reports from the /edgar_filings/archive endpoint."""
     logger.info(f"Getting SEC reports for {symbol}")
     
@@ -159,52 +360,58 @@ def get_sec_reports(symbol: str, start_date: str, end_date: str, exchange:str, l
         'form_type': '8-K'
     }
     
-    data = make_api_request('edgar_filings/archive', params, logger)
+    data = await make_api_request(session, 'edgar_filings/archive', params, logger)
     
     # Edgar filings API returns data in 'values' array format as per documentation
     if not data or 'values' not in data:
         logger.warning(f"No SEC reports found for {symbol}")
         return []
     
-    logger.debug(f"Found {len(data['values'])} SEC reports for {symbol}")
+    logger.debug("Found %s SEC reports for %s", len(data['values']), symbol)
     
     reports = []
     for i, report in enumerate(data['values']):
-        logger.debug(f"Processing report {i+1}/{len(data['values'])} for {symbol}")
+        logger.debug("Processing report %s/%s for %s", i+1, len(data['values']), symbol)
         
         if 'files' not in report:
-            logger.debug(f"Report {i+1} has no files, skipping")
+            logger.debug("Report %s has no files, skipping", i+1)
             continue
             
         # Process only .htm files
         htm_files = [f for f in report['files'] if f.get('url', '').endswith('.htm')]
-        logger.debug(f"Found {len(htm_files)} .htm files in report {i+1}")
+        logger.debug("Found %s .htm files in report %s", len(htm_files), i+1)
         
         if not htm_files:
-            logger.debug(f"No .htm files found in report {i+1}, skipping")
+            logger.debug("No .htm files found in report %s, skipping", i+1)
             continue
-            
-        # Check each file for dividend content
-        matched_files = []
+        
+        # Use the full URL as provided by the API (no need to construct)
+        candidates = []
         for j, file_info in enumerate(htm_files):
             file_url = file_info.get('url', '')
             if not file_url:
-                logger.debug(f"File {j+1} has no URL, skipping")
+                logger.debug("File %s has no URL, skipping", j+1)
+                continue
+            if file_info.get('size', 0) > MAX_SEC_FILE_SIZE:
+                logger.debug("File %s is %s bytes, skipping", j+1, file_info['size'])
                 continue
             file_url = file_url.replace("/ix?doc=/Archives", "/Archives")
-                
-            # Use the full URL as provided by the API (no need to construct)
-            logger.debug(f"Checking file {j+1}/{len(htm_files)}: {file_url}")
-            
-            # Download and check content
-            if check_dividend_content(file_url, logger):
+            logger.debug("Checking file %s/%s: %s", j+1, len(htm_files), file_url)
+            candidates.append((j, file_info, file_url))
+        
+        # Download and check all files of the report concurrently
+        results = await asyncio.gather(*(check_dividend_content_once(sec_client, sec_cache, file_url, logger) for _, _, file_url in candidates))
+        
+        matched_files = []
+        for (j, file_info, file_url), has_dividend in zip(candidates, results):
+            if has_dividend:
                 matched_files.append({
                     'url': file_url,
                     'type': file_info.get('type', '')
                 })
-                logger.debug(f"File {j+1} contains dividend content, added to results")
+                logger.debug("File %s contains dividend content, added to results", j+1)
             else:
-                logger.debug(f"File {j+1} does not contain dividend content, skipping")
+                logger.debug("File %s does not contain dividend content, skipping", j+1)
         
         # Only include reports with matched files
         if matched_files:
@@ -217,57 +424,115 @@ def get_sec_reports(symbol: str, start_date: str, end_date: str, exchange:str, l
                 'filed_at': filed_at_date,
                 'files': matched_files
             })
-            logger.debug(f"Report {i+1} added with {len(matched_files)} matching files")
+            logger.debug("Report %s added with %s matching files", i+1, len(matched_files))
         else:
-            logger.debug(f"Report {i+1} has no matching files, skipping")
+            logger.debug("Report %s has no matching files, skipping", i+1)
     
     logger.info(f"Found {len(reports)} SEC reports with dividend content for {symbol}")
     return reports
 
 
-def check_dividend_content(url: str, logger: logging.Logger) -> bool:
-    """Check if a file contains the word 'dividend'."""
+async def scan_for_dividend(response: httpx.Response) -> Tuple[bool, int]:
+    """Stream a response body until one of DIVIDEND_KEYWORDS is found (case-insensitive).
+    
+    Returns whether it was found and the number of bytes scanned. The tail of the
+    previous chunk is joined with the start of the next one to catch matches
+    straddling a chunk boundary, without copying whole chunks. At most
+    SCAN_MAX_BYTES are read, also when the server ignored the Range header.
+    """
+    scanned = 0
+    tail = b''
+    async for chunk in response.aiter_bytes(SCAN_CHUNK_SIZE):
+        scanned += len(chunk)
+        if DIVIDEND_PATTERN.search(chunk) or DIVIDEND_PATTERN.search(tail + chunk[:SCAN_OVERLAP]):
+            return True, scanned
+        if scanned >= SCAN_MAX_BYTES:
+            break
+        tail = chunk[-SCAN_OVERLAP:]
+    return False, scanned
+
+
+def check_dividend_content_once(sec_client: httpx.AsyncClient, sec_cache: sqlite3.Connection, url: str, logger: logging.Logger) -> asyncio.Task:
+    """Return the check task for a URL, starting it only if the URL was not seen before in this run."""
+    task = sec_url_checks.get(url)
+    if task is None:
+        task = asyncio.ensure_future(check_dividend_content(sec_client, sec_cache, url, logger))
+        sec_url_checks[url] = task
+    else:
+        logger.debug("Reusing check of %s from this run", url)
+    return task
+
+
+async def check_dividend_content(sec_client: httpx.AsyncClient, sec_cache: sqlite3.Connection, url: str, logger: logging.Logger) -> bool:
+    """Check if a file contains the word 'dividend' (or another of DIVIDEND_KEYWORDS)."""
     try:
+        # Files in the EDGAR archive are immutable once filed, so a cached result is final;
+        # anything else is revalidated instead of downloaded again
+        cached = get_cached_result(sec_cache, url)
+        if cached and url.startswith(SEC_ARCHIVES_PREFIX):
+            logger.debug("Using cached result for %s", url)
+            return cached[1]
+        
         # Generate a random user agent for this request
         user_agent = generate_random_user_agent()
-        headers = {'User-Agent': user_agent}
-        logger.debug(f"Downloading content from: {url}")
-        logger.debug(f"Using User-Agent: {headers['User-Agent']}")
-        
-        start_time = time.time()
-        response = requests.get(url, headers=headers, timeout=30)
-        download_duration = time.time() - start_time
-        
-        logger.debug(f"Download completed in {download_duration:.2f} seconds")
-        logger.debug(f"Response status: {response.status_code}, Content length: {len(response.text)} chars")
-        
-        response.raise_for_status()
+        headers = {'User-Agent': user_agent, 'Range': SCAN_RANGE}
+        if cached and cached[0]:
+            headers['If-None-Match'] = cached[0]
         
-        # Add delay after each request
-        delay = 1.0
-        logger.debug(f"Adding delay of {delay:.2f} seconds")
-        time.sleep(delay)
+        async with SEC_SEMAPHORE:
+            logger.debug("Downloading content from: %s", url)
+            logger.debug("Using User-Agent: %s", headers['User-Agent'])
+            
+            start_time = time.time()
+            response = await stream_sec_file(sec_client, url, headers, logger)
+            try:
+                if response.status_code == 304 and cached:
+                    logger.debug("%s not modified, using cached result", url)
+                    etag, has_dividend = cached
+                    scanned = 0
+                else:
+                    response.raise_for_status()
+                    etag = response.headers.get('ETag')
+                    content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+                    # A 206 response's Content-Length only covers the requested range;
+                    # the full file size is the total in Content-Range (bytes 0-N/TOTAL)
+                    total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                    if response.status_code == 206 and total.isdigit():
+                        file_size = int(total)
+                    else:
+                        file_size = int(response.headers.get('Content-Length', 0))
+                    
+                    if content_type not in SEC_HTML_TYPES or file_size > MAX_SEC_FILE_SIZE:
+                        logger.debug("Skipping %s: %s, %s bytes", url, content_type, file_size)
+                        has_dividend, scanned = False, 0
+                    else:
+                        has_dividend, scanned = await scan_for_dividend(response)
+            finally:
+                # Closing early only resets this HTTP/2 stream; the connection stays open
+                await response.aclose()
+            download_duration = time.time() - start_time
+            
+            logger.debug("Download completed in %.2f seconds", download_duration)
+            logger.debug("Response status: %s, Scanned: %s bytes", response.status_code, scanned)
         
-        # Search for 'dividend' in content (case-insensitive)
-        content = response.text.lower()
-        has_dividend = 'dividend' in content
+        store_cached_result(sec_cache, url, etag, has_dividend)
         
         if has_dividend:
-            logger.debug(f"✓ Found 'dividend' content in {url}")
+            logger.debug("✓ Found dividend content in %s", url)
         else:
-            logger.debug(f"✗ No 'dividend' content found in {url}")
+            logger.debug("✗ No dividend content found in %s", url)
             
         return has_dividend
         
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to download {url}: {e}")
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to download {url}: {e!r}")
         return False
     except Exception as e:
         logger.error(f"Unexpected error while checking {url}: {e}")
         return False
 
 
-def get_dividends(symbol: str, start_date: str, end_date: str, exchange: str, logger: logging.Logger) -> List[Dict]:
+async def get_dividends(session: aiohttp.ClientSession, symbol: str, start_date: str, end_date: str, exchange: str, logger: logging.Logger) -> List[Dict]:
     """Load dividends for the symbol from the /dividends_calendar endpoint."""
     logger.info(f"Getting dividends for {symbol}")
     
@@ -278,7 +543,7 @@ def get_dividends(symbol: str, start_date: str, end_date: str, exchange: str, lo
         'exchange': exchange
     }
     
-    data = make_api_request('dividends_calendar', params, logger)
+    data = await make_api_request(session, 'dividends_calendar', params, logger)
     
     # Dividends calendar API returns a flat array as per documentation
     if not data or not isinstance(data, list):
@@ -298,17 +563,17 @@ def get_dividends(symbol: str, start_date: str, end_date: str, exchange: str, lo
         filtered_dividends.append(filtered_dividend)
     
     logger.info(f"Found {len(filtered_dividends)} dividend records for {symbol}")
-    logger.debug(f"Dividend data for {symbol}: {filtered_dividends}")
+    logger.debug("Dividend data for %s: %s", symbol, filtered_dividends)
     
     return filtered_dividends
 
 
-def process_symbol(symbol: str, exchange: str, start_date: str, end_date: str, logger: logging.Logger) -> Optional[Dict]:
+async def process_symbol(session: aiohttp.ClientSession, sec_client: httpx.AsyncClient, sec_cache: sqlite3.Connection, symbol: str, exchange: str, start_date: str, end_date: str, logger: logging.Logger) -> Optional[Dict]:
     """Process a single symbol and return its data."""
     logger.info(f"Processing symbol: {symbol} on {exchange}")
     
     # Get symbol info
-    symbol_info = get_symbol_info(symbol, exchange, logger)
+    symbol_info = await get_symbol_info(session, symbol, exchange, logger)
     if not symbol_info:
         logger.warning(f"Skipping {symbol} - no symbol info found")
         return None
@@ -317,12 +582,12 @@ def process_symbol(symbol: str, exchange: str, start_date: str, end_date: str, l
     actual_exchange = symbol_info['exchange']
     
     # Get SEC reports
-    sec_reports = get_sec_reports(symbol, start_date, end_date, actual_exchange, logger)
+    sec_reports = await get_sec_reports(session, sec_client, sec_cache, symbol, start_date, end_date, actual_exchange, logger)
     if not sec_reports:
         return None
     
     # Get dividends
-    dividends = get_dividends(symbol, start_date, end_date, actual_exchange, logger)
+    dividends = await get_dividends(session, symbol, start_date, end_date, actual_exchange, logger)
     if not dividends:
         return None
     
@@ -335,17 +600,109 @@ def process_symbol(symbol: str, exchange: str, start_date: str, end_date: str, l
     }
     
     logger.info(f"Successfully processed {symbol}: {len(dividends)} dividends, {len(sec_reports)} SEC reports")
-    logger.debug(f"Full result for {symbol}: {result}")
+    logger.debug("Full result for %s: %s", symbol, result)
     
     return result
 
 
+def open_checkpoint(filename: str, logger: logging.Logger) -> Tuple[BinaryIO, Set[str]]:
+    """Open the checkpoint file for appending and return it with the tickers it already holds."""
+    checkpoint = open(filename, 'ab+')
+    checkpoint.seek(0)
+    
+    done_symbols = set()
+    line = b''
+    for line in checkpoint:
+        try:
+            done_symbols.add(orjson.loads(line)['ticker'])
+        except (orjson.JSONDecodeError, KeyError):
+            logger.warning(f"Ignoring invalid checkpoint line in {filename}")
+    
+    # Terminate a line left incomplete by a crash so new entries start on their own line
+    if line and not line.endswith(b'\n'):
+        checkpoint.write(b'\n')
+    
+    return checkpoint, done_symbols
+
+
+def write_checkpoint(checkpoint: BinaryIO, symbol_data: Dict):
+    """Append a processed symbol to the checkpoint file and flush it to disk."""
+    checkpoint.write(orjson.dumps(symbol_data, option=orjson.OPT_APPEND_NEWLINE))
+    checkpoint.flush()
+    os.fsync(checkpoint.fileno())
+
+
+def read_checkpoint(filename: str) -> List[Dict]:
+    """Read all valid symbol entries from the checkpoint file."""
+    results = []
+    with open(filename, 'rb') as f:
+        for line in f:
+            try:
+                results.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+    return results
+
+
+def write_output(filename: str, results: List[Dict], compress: bool) -> str:
+    """Write results as indented JSON, optionally zstd-compressed, and return the file name.
+    
+    The data is written to a temporary file first and moved into place, so an
+    interrupted write never leaves a truncated output file behind.
+    """
+    data = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+    if compress:
+        filename += '.zst'
+        data = zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    
+    tmp_filename = filename + '.tmp'
+    with open(tmp_filename, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+    return filename
+
+
+async def process_symbols(symbols: List[Tuple[str, str]], start_date: str, end_date: str, workers: int, checkpoint: BinaryIO, logger: logging.Logger) -> List:
+    """Process symbols concurrently, saving each result to the checkpoint as soon as it is ready.
+    
+    Returns, in input order, True for symbols saved to the checkpoint, None for skipped
+    symbols, or the exception raised while processing the symbol.
+    """
+    sem = asyncio.Semaphore(workers)
+    sec_cache = open_sec_cache(SEC_CACHE_PATH)
+    completed = 0
+    
+    try:
+        async with create_session() as session, create_sec_client() as sec_client:
+            async def run(symbol: str, exchange: str) -> Optional[bool]:
+                nonlocal completed
+                async with sem:
+                    try:
+                        symbol_data = await process_symbol(session, sec_client, sec_cache, symbol, exchange, start_date, end_date, logger)
+                        if not symbol_data:
+                            return None
+                        write_checkpoint(checkpoint, symbol_data)
+                        return True
+                    finally:
+                        completed += 1
+                        logger.info(f"Progress: {completed}/{len(symbols)} - Finished {symbol} on {exchange}")
+            
+            tasks = [run(symbol, exchange) for symbol, exchange in symbols]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        sec_cache.close()
+
+
 def main():
     """Main function to process all symbols and generate JSON output."""
     parser = argparse.ArgumentParser(description='Extract dividends and SEC reports data')
     parser.add_argument('start_date', help='Start date for API requests (YYYY-MM-DD)')
     parser.add_argument('end_date', help='End date for API requests (YYYY-MM-DD)')
     parser.add_argument('--limit', type=int, default=0, help='Limit symbols for processing (0 = no limit)')
+    parser.add_argument('--workers', type=int, default=SYMBOL_CONCURRENCY, help=f'Number of symbols processed concurrently (default: {SYMBOL_CONCURRENCY})')
+    parser.add_argument('--compress', action='store_true', help='Compress the output JSON with zstd')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
     
     args = parser.parse_args()
@@ -356,8 +713,17 @@ def main():
     logger.info("Starting Twelve Data dividends extractor")
     logger.info(f"Date range: {args.start_date} to {args.end_date}")
     logger.info(f"Limit: {args.limit if args.limit > 0 else 'No limit'}")
+    logger.info(f"Workers: {args.workers}")
     logger.info(f"Debug mode: {'Enabled' if args.debug else 'Disabled'}")
     
+    if args.workers < 1:
+        logger.error("--workers must be at least 1")
+        return 1
+    
+    if API_REQUESTS_PER_MINUTE < 1:
+        logger.error("TWELVE_DATA_REQUESTS_PER_MINUTE must be at least 1")
+        return 1
+    
     # Validate date format
     try:
         datetime.strptime(args.start_date, '%Y-%m-%d')
@@ -369,7 +735,8 @@ def main():
     
     # Load symbols
     try:
-        symbols = load_symbols('symbols.csv')
+        all_symbols = load_symbols('symbols.csv')
+        symbols = all_symbols
         logger.info(f"Loaded {len(symbols)} symbols from symbols.csv")
         logger.debug(f"First 10 symbols: {symbols[:10]}")
     except FileNotFoundError:
@@ -381,34 +748,43 @@ def main():
         symbols = symbols[:args.limit]
         logger.info(f"Processing limited to {len(symbols)} symbols")
     
+    # Resume from the checkpoint of an interrupted run with the same date range
+    os.makedirs('output', exist_ok=True)
+    checkpoint_filename = f"output/checkpoint_{args.start_date}_{args.end_date}.jsonl"
+    checkpoint, done_symbols = open_checkpoint(checkpoint_filename, logger)
+    if done_symbols:
+        symbols = [(s, e) for s, e in symbols if s not in done_symbols]
+        logger.info(f"Resuming from {checkpoint_filename}: {len(done_symbols)} symbols already processed, {len(symbols)} remaining")
+    
     # Process symbols
-    results = []
     successful_count = 0
     failed_count = 0
     
-    for i, (symbol, exchange) in enumerate(symbols, 1):
-        logger.info(f"Progress: {i}/{len(symbols)} - Processing {symbol} on {exchange}")
-        
-        try:
-            symbol_data = process_symbol(symbol, exchange, args.start_date, args.end_date, logger)
-            if symbol_data:
-                results.append(symbol_data)
-                successful_count += 1
-                logger.info(f"✓ Successfully processed {symbol}")
-            else:
-                failed_count += 1
-                logger.warning(f"✗ Skipped {symbol}")
-        except Exception as e:
+    try:
+        outcomes = asyncio.run(process_symbols(symbols, args.start_date, args.end_date, args.workers, checkpoint, logger))
+    finally:
+        checkpoint.close()
+    
+    for (symbol, exchange), outcome in zip(symbols, outcomes):
+        if isinstance(outcome, Exception):
             failed_count += 1
-            logger.error(f"✗ Error processing {symbol}: {e}", exc_info=args.debug)
-            continue
+            logger.error(f"✗ Error processing {symbol}: {outcome}", exc_info=outcome if args.debug else False)
+        elif outcome:
+            successful_count += 1
+            logger.info(f"✓ Successfully processed {symbol}")
+        else:
+            failed_count += 1
+            logger.warning(f"✗ Skipped {symbol}")
     
-    # Export to JSON in output folder
-    os.makedirs('output', exist_ok=True)
+    # Export checkpointed results to JSON in output folder, in symbols.csv order
     output_filename = f"output/dividends_data_{args.start_date}_{args.end_date}.json"
     try:
-        with open(output_filename, 'w') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        results = read_checkpoint(checkpoint_filename)
+        order = {symbol: i for i, (symbol, _) in enumerate(all_symbols)}
+        results.sort(key=lambda d: order.get(d['ticker'], len(order)))
+        
+        output_filename = write_output(output_filename, results, args.compress)
+        os.remove(checkpoint_filename)
         
         logger.info(f"Exported {len(results)} symbols to {output_filename}")
         logger.info(f"Processing complete! Success: {successful_count}, Failed: {failed_count}")
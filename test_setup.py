@@ -3,61 +3,201 @@
 Test script to verify the setup and API connectivity.
 """
 
+import asyncio
+import csv
+import json
 import os
-from dotenv import load_dotenv
-import requests
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+import httpx
+from dotenv import dotenv_values
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib JSON parser
+    orjson = None
+
+STOCKS_URL = "https://api.twelvedata.com/stocks"
+# Twelve Data API keys are 32 hex characters; "demo" is the public demo key
+TWELVEDATA_KEY_RE = re.compile(r'[0-9a-fA-F]{32}|demo')
+PROBE_SYMBOLS = ("AAPL", "MSFT", "GOOG")
+BATCH_SIZE = 120  # Symbols per request, keeps the URL within length limits
+
+# Retry policy for connection failures, rate-limit and transient server responses
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+
+class TwelveDataError(Exception):
+    """Error body returned by Twelve Data, often with HTTP 200 (e.g. an invalid key or rate limit)."""
+
+@lru_cache(maxsize=1)
+def _env():
+    """Parse .env once with python-dotenv, the same parser extract_dividends.py loads it with.
+    
+    Values are returned rather than exported to os.environ. Opening the file
+    directly raises FileNotFoundError if it is missing.
+    """
+    with open('.env', encoding='utf-8') as stream:
+        return dotenv_values(stream=stream)
+
+@lru_cache(maxsize=1)
+def _load_symbols():
+    """Read the tickers from symbols.csv once, with a single bulk read."""
+    rows = csv.reader(Path('symbols.csv').read_text().splitlines())
+    index = next(rows).index('symbol_ticker')
+    return tuple(row[index].strip() for row in rows if row and row[index].strip())
+
+def _phase_timer(timings):
+    """Build an httpx trace hook adding connect (DNS+TCP+TLS) and server wait times to timings."""
+    started = {}
+    async def trace(event_name, info):
+        now = time.monotonic_ns()
+        phase = event_name.split('.', 1)[1]  # Drop the http11/http2/connection prefix
+        if phase == 'connect_tcp.started':
+            started['connect'] = now
+        elif phase in ('connect_tcp.complete', 'start_tls.complete') and 'connect' in started:
+            # Restart the clock so the TLS handshake is added on top of the TCP connect
+            timings['connect_ms'] += (now - started['connect']) / 1e6
+            started['connect'] = now
+        elif phase == 'send_request_headers.started':
+            started['server'] = now
+        elif phase == 'receive_response_headers.complete' and 'server' in started:
+            timings['server_ms'] += (now - started.pop('server')) / 1e6
+    return trace
+
+async def _get_with_retry(client, url, params, extensions=None):
+    """GET a URL, retrying connection failures and 429/5xx responses with exponential backoff or the server's Retry-After."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.get(url, params=params, extensions=extensions)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(BACKOFF_FACTOR * (2 ** attempt))
+            continue
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return response
+        retry_after = response.headers.get('Retry-After', '')
+        await asyncio.sleep(int(retry_after) if retry_after.isdigit() else BACKOFF_FACTOR * (2 ** attempt))
+
+async def _probe(client, symbols, api_key, timings=None):
+    """Query the /stocks endpoint for a comma-joined batch of symbols, adding phase times to timings if given."""
+    extensions = {'trace': _phase_timer(timings)} if timings is not None else None
+    response = await _get_with_retry(client, STOCKS_URL, {'symbol': ','.join(symbols), 'apikey': api_key}, extensions)
+    response.raise_for_status()
+    t0 = time.monotonic_ns()
+    data = orjson.loads(response.content) if orjson else response.json()
+    if timings is not None:
+        timings['parse_ms'] += (time.monotonic_ns() - t0) / 1e6
+    return data
+
+async def batch_fetch(client, symbols, api_key, chunk=BATCH_SIZE, timings=None):
+    """Fetch /stocks data for many symbols with one request per chunk of symbols.
+    
+    Raises TwelveDataError if any chunk returns an error body, so a partial
+    result is never mistaken for a complete one.
+    """
+    batches = [symbols[i:i + chunk] for i in range(0, len(symbols), chunk)]
+    results = await asyncio.gather(*[_probe(client, batch, api_key, timings) for batch in batches])
+    for data in results:
+        if data.get('status') == 'error':
+            raise TwelveDataError(f"{data.get('code')}: {data.get('message', 'Unknown error')}")
+    return [item for data in results for item in data.get('data') or []]
+
+async def _probe_all(api_key):
+    """Probe all test symbols in a single batched request, returning the items and phase timings."""
+    timings = dict.fromkeys(('connect_ms', 'server_ms', 'parse_ms'), 0.0)
+    # No custom transport, so httpx applies HTTP(S)_PROXY, ALL_PROXY and NO_PROXY itself
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=httpx.Timeout(10.0, connect=3.05)
+    ) as client:
+        items = await batch_fetch(client, list(PROBE_SYMBOLS), api_key, timings=timings)
+    return items, timings
 
 def test_setup():
     """Test if the environment is properly configured."""
     print("Testing Twelve Data Dividends Extractor Setup...")
     print("=" * 50)
     
-    # Test 1: Check if .env file exists and loads
-    if not os.path.exists('.env'):
+    # Test 1: Check if .env file exists and loads (opening it directly, no separate stat)
+    try:
+        env = _env()
+    except FileNotFoundError:
         print("❌ .env file not found. Please copy .env.example to .env and add your API key.")
         return False
     
-    load_dotenv()
-    api_key = os.getenv('TWELVE_DATA_API_KEY')
+    # Variables already set in the environment take precedence, as with python-dotenv
+    api_key = os.getenv('TWELVE_DATA_API_KEY') or env.get('TWELVE_DATA_API_KEY')
     
     if not api_key or api_key == 'your_twelve_data_api_key_here':
         print("❌ TWELVE_DATA_API_KEY not set or still has placeholder value.")
         print("   Please edit .env file and add your actual API key.")
         return False
     
+    # Reject malformed keys locally, without a round-trip to the API
+    if not TWELVEDATA_KEY_RE.fullmatch(api_key):
+        print("❌ API key format invalid - expected 32 hexadecimal characters.")
+        print("   Please check the TWELVE_DATA_API_KEY value in your .env file.")
+        return False
+    
     print("✅ Environment variables loaded successfully")
     
-    # Test 2: Check if symbols.txt exists
-    if not os.path.exists('symbols.txt'):
-        print("❌ symbols.txt file not found")
+    # Test 2: Check if symbols.csv exists and has symbols
+    try:
+        symbols = _load_symbols()
+    except FileNotFoundError:
+        print("❌ symbols.csv file not found")
+        return False
+    except (StopIteration, ValueError):
+        print("❌ symbols.csv has no symbol_ticker column")
+        return False
+    
+    if not symbols:
+        print("❌ symbols.csv contains no symbols")
         return False
     
-    print("✅ symbols.txt file found")
+    print(f"✅ symbols.csv file found with {len(symbols)} symbols")
     
     # Test 3: Test API connectivity
     try:
-        url = "https://api.twelvedata.com/stocks"
-        params = {
-            'symbol': 'AAPL',
-            'apikey': api_key
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        items, timings = asyncio.run(_probe_all(api_key))
         
-        if 'data' in data and data['data']:
-            print("✅ API connectivity test successful")
-            print(f"   Test query returned data for AAPL: {data['data'][0].get('name', 'Unknown')}")
-        else:
-            print("❌ API returned empty data - check your API key")
+        if not items:
+            print("❌ API returned no data for the test symbols")
             return False
+        
+        # A symbol may be listed on several exchanges; report the first listing of each
+        names = {}
+        for item in items:
+            names.setdefault(item.get('symbol'), item.get('name', 'Unknown'))
+        
+        print("✅ API connectivity test successful")
+        for symbol in PROBE_SYMBOLS:
+            if symbol in names:
+                print(f"   Test query returned data for {symbol}: {names[symbol]}")
+            else:
+                print(f"   ⚠️  Test query returned no data for {symbol}")
+        
+        # Show whether the probe is dominated by network I/O or by JSON parsing
+        bound = 'cpu' if timings['parse_ms'] > timings['connect_ms'] + timings['server_ms'] else 'io'
+        print(f"   Timing: connect {timings['connect_ms']:.1f} ms, server {timings['server_ms']:.1f} ms, "
+              f"parse {timings['parse_ms']:.1f} ms ({bound}-bound)")
+        # One-line machine-readable summary, so CI can track regressions
+        print(json.dumps({**{key: round(value, 2) for key, value in timings.items()}, 'bound': bound}))
             
-    except requests.exceptions.RequestException as e:
+    except TwelveDataError as e:
+        print(f"❌ API returned an error - {e}")
+        return False
+    except httpx.HTTPError as e:
         print(f"❌ API connectivity test failed: {e}")
         return False
-    except Exception as e:
-        print(f"❌ Unexpected error during API test: {e}")
+    except ValueError as e:
+        print(f"❌ API returned an invalid JSON response: {e}")
         return False
     
     print("\n🎉 All tests passed! You're ready to run the extractor.")